@@ -2,14 +2,62 @@
 
 import os
 import random
-import numpy as np
-import torch
+import sys
+import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import hydra
-from omegaconf import DictConfig, OmegaConf
+from omegaconf import DictConfig, OmegaConf, SCMode
 from hydra.utils import instantiate
 
+# Process-wide cache of partially instantiated configs, keyed by their resolved values.
+# In an in-process Hydra sweep (e.g. the basic multirun launcher) this avoids redoing
+# Hydra's config processing for blocks that are identical across runs.
+_INSTANTIATE_CACHE = {}
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+def _cached_instantiate(cfg_node):
+    """
+    Instantiate a config block, reusing Hydra's work for identical configs.
+
+    A partial (`_partial_=True`) is cached instead of the object itself, so every call
+    still returns a fresh object: loggers are closed and models are trained per run.
+    Only flat blocks with a `_target_` and primitive values are cached, since nested
+    objects or containers would be shared between the returned objects. Everything
+    else, including the nested default model config and logging blocks with list
+    values such as `tags`, is instantiated normally.
+    """
+    # Cheap checks on the top level first, so nested blocks skip any extra traversal.
+    if not OmegaConf.is_dict(cfg_node) or "_target_" not in cfg_node or "_partial_" in cfg_node:
+        return instantiate(cfg_node)
+    params = dict(cfg_node.items())
+    if params["_target_"] is None or not all(isinstance(value, _PRIMITIVES) for value in params.values()):
+        return instantiate(cfg_node)
+    # Include the type: True == 1 == 1.0 would otherwise share one cache entry.
+    key = tuple(sorted((k, type(v).__name__, v) for k, v in params.items()))
+    factory = _INSTANTIATE_CACHE.get(key)
+    if factory is None:
+        factory = _INSTANTIATE_CACHE[key] = instantiate(cfg_node, _partial_=True)
+    return factory()
+
+
+# Directories already created by this process; repeated sweep runs skip the mkdir syscalls.
+_DIR_CACHE: set[str] = set()
+
+
+def ensure_dir(path):
+    """
+    Create a directory (and its parents) unless this process already did so.
+    """
+    key = str(path)
+    if key in _DIR_CACHE:
+        return
+    Path(path).mkdir(parents=True, exist_ok=True)
+    _DIR_CACHE.add(key)
+
+
 def run_experiment(model, dataset, logger, device, cfg):
     """
     Runs the main machine-learning experiment steps.
@@ -27,7 +75,7 @@ def run_experiment(model, dataset, logger, device, cfg):
         dataset: The data object needed for training or evaluation.
         logger: A logger object for tracking experiment metrics, hyperparams, etc.
         device: A string or torch.device indicating where computations take place.
-        cfg (DictConfig): The entire Hydra config, if you need to reference more params.
+        cfg (dict): The entire Hydra config, resolved to a plain dictionary.
     """
     # Example usage demonstration; replace with your real ML steps:
     print(f"[run_experiment] device={device}, model={model}, dataset={dataset}")
@@ -62,6 +110,10 @@ def main(cfg: DictConfig):
     # -------------------- 1. Seed Setup --------------------
     seed = cfg.get("seed", None)
     if seed is not None:
+        # Imported here so that e.g. `--help` or `--cfg job` does not pay for torch.
+        import numpy as np
+        import torch
+
         random.seed(seed)
         np.random.seed(seed)
         torch.manual_seed(seed)
@@ -70,22 +122,42 @@ def main(cfg: DictConfig):
     # -------------------- 2. Directory Preparation --------------------
     results_dir = Path(cfg.results_dir)
     data_dir = Path(cfg.data_dir)
-    results_dir.mkdir(parents=True, exist_ok=True)
-    data_dir.mkdir(parents=True, exist_ok=True)
+    ensure_dir(results_dir)
+    ensure_dir(data_dir)
     print(f"[main] results_dir: {results_dir}")
     print(f"[main] data_dir: {data_dir}")
 
     # -------------------- 3. Print Resolved Config --------------------
-    # Always helpful for reproducibility
-    print("[main] Full config:\n", OmegaConf.to_yaml(cfg, resolve=True))
+    # Resolve interpolations once; the plain dict is reused for printing,
+    # hyperparameter logging and run_experiment(). The DictConfig is only
+    # kept around for instantiate().
+    resolved = OmegaConf.to_container(
+        cfg, resolve=True, throw_on_missing=True, enum_to_str=True,
+        structured_config_mode=SCMode.DICT,
+    )
+    # Hydra already stores the config in the run directory (.hydra/config.yaml);
+    # set print_config=true to also dump it to stdout. The YAML is formatted on a
+    # worker thread while the objects below are instantiated. Both are Python-bound
+    # and share the GIL, so this only overlaps with blocking I/O such as the network
+    # part of the logger's wandb login. The dump is printed even if instantiation fails.
+    config_dump = None
+    if cfg.get("print_config", False):
+        dump_pool = ThreadPoolExecutor(max_workers=1)
+        config_dump = dump_pool.submit(yaml.safe_dump, resolved, sort_keys=False)
+        dump_pool.shutdown(wait=False)
 
     # -------------------- 4. Object Instantiation --------------------
-    # (A) A logger, typically includes run_name/tags from the config
-    logger = instantiate(cfg.logging)
-    
-    # (B) A model and dataset, each presumably has '_target_' in their config file
-    model = instantiate(cfg.model)
-    dataset = instantiate(cfg.dataset)
+    try:
+        # (A) A logger, typically includes run_name/tags from the config
+        logger = _cached_instantiate(cfg.logging)
+
+        # (B) A model and dataset, each presumably has '_target_' in their config file.
+        # The dataset is always instantiated fresh since it may carry mutable state.
+        model = _cached_instantiate(cfg.model)
+        dataset = instantiate(cfg.dataset)
+    finally:
+        if config_dump is not None:
+            sys.stdout.write("[main] Full config:\n" + config_dump.result())
 
     # -------------------- Partial Instantiation Example --------------------
     # Suppose you have a config that doesn't fully specify the constructor arguments:
@@ -104,7 +176,7 @@ def main(cfg: DictConfig):
     # If you don't need partial instantiation, remove or ignore this snippet.
 
     # (C) Log hyperparameters before the experiment
-    logger.log_hyperparams(cfg)
+    logger.log_hyperparams(resolved)
 
     # -------------------- 5. Run the Experiment --------------------
     device = cfg.get("device", "cpu")
@@ -113,7 +185,7 @@ def main(cfg: DictConfig):
         dataset=dataset,
         logger=logger,
         device=device,
-        cfg=cfg
+        cfg=resolved
     )
 
     # -------------------- 6. Clean Up --------------------
@@ -1,13 +1,102 @@
+import atexit
+import functools
+import importlib
 import os 
-from typing import Any, Dict
+import queue
+import threading
+import time
+import warnings
+import weakref
+from typing import Any, Dict, Iterator, Tuple
 
-import matplotlib
-import matplotlib.axes
-import matplotlib.figure
 import numpy as np
-import wandb
 from pytorch_lightning.loggers import WandbLogger, TensorBoardLogger, Logger
-from PIL import Image
+
+# wandb, matplotlib, PIL and the TensorBoard summary helpers are slow to import,
+# so they are only loaded (once) when a log call actually needs them.
+_MODULES: Dict[str, Any] = {}
+
+
+def _lazy(name: str, optional: bool = False):
+    """
+    Import a module on first use and return the cached module afterwards.
+    With optional=True a missing module returns None, and the failed import is cached too.
+    """
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            if not optional:
+                raise
+            module = None
+        _MODULES[name] = module
+    if module is None and not optional:
+        raise ImportError("No module named '{}'".format(name))
+    return module
+
+
+def _render_figure(figure):
+    """
+    Render a matplotlib figure to an (H, W, 3) uint8 array and close it, like add_figure does.
+    Called on the logging thread, since matplotlib is not thread-safe.
+    """
+    canvas = _lazy("matplotlib.backends.backend_agg").FigureCanvasAgg(figure)
+    canvas.draw()
+    image = np.asarray(canvas.buffer_rgba())[:, :, :3].copy()
+    _lazy("matplotlib.pyplot").close(figure)
+    return image
+
+
+def _copy_array(value):
+    # The caller may reuse its buffer right after log(), so take a private copy.
+    return np.array(value)
+
+
+def _pil_to_array(value):
+    # PIL hands numpy a freshly created bytes buffer, so the result stays valid after
+    # the image is closed without a second copy.
+    return np.asarray(value)
+
+
+# Dispatch marker for scalars: they are not converted but collected and written
+# together by _log_scalars.
+_SCALAR = object()
+
+
+def _log_scalars(writer, scalars, step, walltime):
+    tensorboard = _lazy("torch.utils.tensorboard", optional=True)
+    if tensorboard is None or not isinstance(writer, tensorboard.SummaryWriter):
+        # E.g. Lightning's tensorboardX fallback: its protobuf types differ, so use the public API.
+        for key, value in scalars.items():
+            writer.add_scalar(tag=key, scalar_value=value, global_step=step, walltime=walltime)
+        return
+    # Merge all scalars of one step into a single Summary so the file writer
+    # serializes and writes one event instead of one event per tag.
+    # Relies on torch's private SummaryWriter._get_file_writer(), which returns the
+    # FileWriter whose add_summary(summary, global_step, walltime) SummaryWriter.add_scalar
+    # uses itself.
+    merged = None
+    for key, value in scalars.items():
+        summary = _lazy("torch.utils.tensorboard.summary").scalar(key, value)
+        if merged is None:
+            merged = summary
+        else:
+            merged.value.extend(summary.value)
+    writer._get_file_writer().add_summary(merged, step, walltime)
+
+
+def _stop_worker(log_q, thread, writer):
+    """
+    Write all queued TensorBoard events and stop the worker thread, if it is still running.
+    Registered with atexit so events logged without close() are not lost.
+    """
+    if thread.is_alive():
+        log_q.put(None)
+        thread.join()
+        writer.flush()
+
 
 class UnifiedExperiment:
     """
@@ -17,24 +106,117 @@ class UnifiedExperiment:
     :param experiment: The underlying experiment object. For Wandb, this is a wandb.Run.
                        For TensorBoard, this is a SummaryWriter.
     :param backend: A string indicating the logging backend ('wandb' or 'tensorboard').
+    :param log_queue: (Optional) Queue drained by a background thread. If given, TensorBoard
+                      writes are handed to it instead of being performed in the calling thread.
+                      Values are copied or rendered before they are queued.
     """
-    def __init__(self, experiment, backend):
+    # Maps a value's concrete type to the function converting it, on the calling thread, to an
+    # (H, W, C) image for TensorBoard, or to _SCALAR. It is filled on first use
+    # so matplotlib and PIL are not imported up front. Subclasses (e.g. PIL's PngImageFile
+    # or np.int64) are resolved once via _tb_converter and then cached here; unsupported
+    # types are cached as None. The dict is never mutated in place: updates build a new
+    # dict and swap it in, so concurrent log() calls never iterate a changing dict.
+    _TB_DISPATCH: Dict[type, Any] = {}
+
+    def __init__(self, experiment, backend, log_queue=None):
         self._backend = backend
         self._experiment = experiment
+        self._log_queue = log_queue
+        # wandb.Image per figure, reused until the figure is drawn again or becomes stale.
+        # Keyed weakly so closed figures do not stay alive.
+        self._img_cache = weakref.WeakKeyDictionary()
+        self._img_watched = weakref.WeakSet()
+
+    @classmethod
+    def _tb_converter(cls, value_type):
+        """
+        Return the TensorBoard converter for a type, or None if the type is not supported.
+        """
+        dispatch = cls._TB_DISPATCH
+        if not dispatch:
+            dispatch = cls._TB_DISPATCH = {
+                _lazy("matplotlib.figure").Figure: _render_figure,
+                np.ndarray: _copy_array,
+                _lazy("PIL.Image").Image: _pil_to_array,
+                float: _SCALAR,
+                int: _SCALAR,
+                np.float32: _SCALAR,
+                np.float64: _SCALAR,
+                np.number: _SCALAR,
+                np.bool_: _SCALAR,
+            }
+        try:
+            return dispatch[value_type]
+        except KeyError:
+            pass
+        converter = None
+        for base, candidate in dispatch.items():
+            if candidate is not None and issubclass(value_type, base):
+                converter = candidate
+                break
+        cls._TB_DISPATCH = {**cls._TB_DISPATCH, value_type: converter}
+        return converter
 
     @staticmethod
-    def _flatten_dict(d: Dict[Any, Any], parent_key: str = "", separator: str = "/") -> Dict[Any, Any]:
+    def _iter_flat(d: Dict[Any, Any], separator: str = "/") -> Iterator[Tuple[Any, Any]]:
         """
-        Recursively flattens a nested dictionary.
+        Yields the (key, value) pairs of a nested dictionary with keys joined by the separator.
+        Uses an explicit stack instead of recursion and builds no intermediate dictionary.
         """
-        items = {}
-        for k, v in d.items():
-            new_key = f"{parent_key}{separator}{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.update(UnifiedExperiment._flatten_dict(v, new_key, separator))
-            else:
-                items[new_key] = v
-        return items
+        stack = [("", d)]
+        while stack:
+            parent_key, current = stack.pop()
+            for k, v in current.items():
+                new_key = f"{parent_key}{separator}{k}" if parent_key else k
+                if isinstance(v, dict):
+                    stack.append((new_key, v))
+                else:
+                    yield new_key, v
+
+    def _convert_figures(self, d: Dict[Any, Any]):
+        """
+        Replaces figures, axes and PIL images in a nested dictionary with wandb.Image objects, in place.
+        Nested dictionaries are replaced by converted copies; all other values are left as they are.
+        Figures that were neither redrawn nor modified since they were last logged reuse their
+        previous wandb.Image.
+        """
+        # Bind the classes used in the loop below to locals once per call.
+        Axes = _lazy("matplotlib.axes").Axes
+        Figure = _lazy("matplotlib.figure").Figure
+        PILImage = _lazy("PIL.Image").Image
+        WandbImage = _lazy("wandb").Image
+        stack = [d]
+        while stack:
+            current = stack.pop()
+            for key, value in current.items():
+                if isinstance(value, dict):
+                    # Copy nested dicts before converting their values.
+                    current[key] = value = dict(value)
+                    stack.append(value)
+                    continue
+                if isinstance(value, Axes):
+                    value = value.get_figure()
+                if isinstance(value, Figure):
+                    cached = self._img_cache.get(value)
+                    if cached is None or value.stale:
+                        if hasattr(value.canvas, "buffer_rgba"):
+                            # Hand wandb the rendered RGBA pixels instead of letting it
+                            # round-trip the figure through savefig and a PNG decode.
+                            value.canvas.draw()
+                            cached = WandbImage(np.asarray(value.canvas.buffer_rgba()))
+                        else:
+                            cached = WandbImage(value)
+                        if value not in self._img_watched:
+                            # Any later draw (explicit, interactive, or by another logger) may show
+                            # changed content, so it drops the cached image. Our own draw above
+                            # happens before the image is stored.
+                            cache = self._img_cache
+                            value.canvas.mpl_connect("draw_event", lambda event: cache.pop(event.canvas.figure, None))
+                            self._img_watched.add(value)
+                        self._img_cache[value] = cached
+                    current[key] = cached
+                elif isinstance(value, PILImage):
+                    current[key] = WandbImage(value)
 
     def log(self, data: Dict[Any, Any]):
         """
@@ -46,37 +228,59 @@ class UnifiedExperiment:
                      - NumPy arrays: assumed to be images for TensorBoard via add_image.
                      - Scalars: logged via add_scalar in TensorBoard.
                      Optionally, an 'epoch' key can be included to specify the global step.
+                     The dictionary (and any nested dictionary) is not modified.
         """
-        step = data.pop("epoch", None)
-        data = self._flatten_dict(data)
+        # Work on a staged copy so callers (possibly on other threads) keep their dict intact.
+        step = data.get("epoch")
+        staged = {k: v for k, v in data.items() if k != "epoch"}
 
         if self._backend == "wandb":
-            # Wandb supports nested dictionaries natively.
-            for key, value in data.items():
-                if isinstance(value, matplotlib.axes.Axes):
-                    value = value.get_figure()
-                if isinstance(value, matplotlib.figure.Figure) or isinstance(value, Image.Image):
-                    data[key] = wandb.Image(value)
-            self._experiment.log(data)
+            # Wandb supports nested dictionaries natively, so no flattening is needed.
+            # Plain scalar metrics (the common per-step case) need no conversion at all.
+            if not all(isinstance(value, (int, float, str, bool)) for value in staged.values()):
+                self._convert_figures(staged)
+            self._experiment.log(staged)
 
         elif self._backend == "tensorboard":
             # Flatten nested dictionaries for TensorBoard.
-            for key, value in data.items():
-
-                if isinstance(value, matplotlib.axes.Axes):
+            Axes = _lazy("matplotlib.axes").Axes
+            walltime = time.time()
+            images = {}
+            scalars = {}
+            for key, value in self._iter_flat(staged):
+                if isinstance(value, Axes):
                     value = value.get_figure()
-                if isinstance(value, matplotlib.figure.Figure):
-                    self._experiment.add_figure(tag=key, figure=value, global_step=step)
-                elif isinstance(value, np.ndarray):
-                    # Assumes image is a numpy array with shape (H, W, C); adjust dataformats if needed.
-                    self._experiment.add_image(tag=key, img_tensor=value, global_step=step, dataformats="HWC")
-                elif isinstance(value, Image.Image):
-                    self._experiment.add_image(tag=key, img_tensor=np.array(value), global_step=step, dataformats="HWC")
-                elif np.isscalar(value) and not isinstance(value, str):
-                    self._experiment.add_scalar(tag=key, scalar_value=value, global_step=step)
-                else:
-                    # Extend handling for other data types if necessary.
-                    pass
+                convert = self._tb_converter(type(value))
+                if convert is _copy_array and value.ndim == 0:
+                    # 0-d arrays (e.g. np.mean results) are scalars, not images.
+                    value = value.item()
+                    convert = _SCALAR
+                if convert is _SCALAR:
+                    # Scalars are collected as Python floats and written as one event.
+                    scalars[key] = value if type(value) is float else float(value)
+                elif convert is not None:
+                    # Convert here so the writer thread only does serialization and I/O
+                    # and never sees objects the caller may change or close.
+                    images[key] = convert(value)
+                # Extend _TB_DISPATCH to handle other data types if necessary.
+            if self._log_queue is not None:
+                self._log_queue.put((step, walltime, images, scalars))
+            else:
+                self.write_tensorboard(step, walltime, images, scalars)
+
+    def write_tensorboard(self, step, walltime, images, scalars):
+        """
+        Write prepared TensorBoard events to the underlying SummaryWriter.
+
+        :param step: Global step for all events.
+        :param walltime: Time of the log() call, recorded with every event.
+        :param images: Dictionary of (H, W, C) image arrays, e.g. rendered figures.
+        :param scalars: Dictionary of scalar values, written as a single event.
+        """
+        for key, image in images.items():
+            self._experiment.add_image(tag=key, img_tensor=image, global_step=step, walltime=walltime, dataformats="HWC")
+        if scalars:
+            _log_scalars(self._experiment, scalars, step, walltime)
 
 class UnifiedLogger(Logger):
     """
@@ -90,16 +294,44 @@ class UnifiedLogger(Logger):
         super().__init__()
         self._backend = backend
         if backend == "wandb":
-            wandb.login(key=os.getenv("WANDB_API_KEY"))
+            _lazy("wandb").login(key=os.getenv("WANDB_API_KEY"))
             self._logger = WandbLogger(**kwargs)
         elif backend == "tensorboard":
             self._logger = TensorBoardLogger(**kwargs)
         else:
             raise ValueError("Unsupported backend: {}".format(backend))
+        # TensorBoard writes are synchronous disk I/O, so they are done on a background thread.
+        self._log_q = None
+        self._log_thread = None
+        self._stop_at_exit = None
+        if backend == "tensorboard":
+            self._log_q = queue.Queue(maxsize=64)
+            self._log_thread = threading.Thread(target=self._drain, daemon=True)
+            self._log_thread.start()
+            # The worker is a daemon thread, so drain it at exit in case close() is never called.
+            self._stop_at_exit = functools.partial(_stop_worker, self._log_q, self._log_thread, self._logger.experiment)
+            atexit.register(self._stop_at_exit)
         # Wrap the underlying experiment with the unified interface.
-        self._experiment = UnifiedExperiment(self._logger.experiment, backend)
+        self._experiment = UnifiedExperiment(self._logger.experiment, backend, log_queue=self._log_q)
         self.log_base_model = not backend == "tensorboard"
 
+    def _drain(self):
+        """
+        Worker loop writing queued TensorBoard events until the None sentinel is received.
+        """
+        log_q = self._log_q
+        while True:
+            item = log_q.get()
+            try:
+                if item is None:
+                    break
+                self._experiment.write_tensorboard(*item)
+            except Exception as e:
+                # Keep draining; a dead worker would block log() once the queue is full.
+                warnings.warn("Failed to write TensorBoard events: {}".format(e))
+            finally:
+                log_q.task_done()
+
     @property
     def experiment(self):
         """
@@ -148,10 +380,22 @@ class UnifiedLogger(Logger):
     def save(self):
         """
         Save the logger state if the underlying logger supports saving.
+        Queued TensorBoard events are written first; Lightning's finalize() also calls this.
         """
+        if self._log_q is not None:
+            self._log_q.join()
+            self._logger.experiment.flush()
         if hasattr(self._logger, "save"):
             self._logger.save()
 
     def close(self):
         if self._backend == "wandb":
-            wandb.finish()
\ No newline at end of file
+            _lazy("wandb").finish()
+        elif self._log_thread is not None:
+            # Later log() calls write synchronously; flush all pending events before returning.
+            self._experiment._log_queue = None
+            self._stop_at_exit()
+            atexit.unregister(self._stop_at_exit)
+            self._log_q = None
+            self._log_thread = None
+            self._stop_at_exit = None
\ No newline at end of file
@@ -1 +1,9 @@
+import os
+import sys
+from pathlib import Path
 
+# The templates are copied into a package by setup.sh; test them in place.
+TEMPLATES = Path(__file__).resolve().parent.parent / "templates"
+sys.path[:0] = [str(TEMPLATES / "log_utils"), str(TEMPLATES / "experiment")]
+
+os.environ.setdefault("MPLBACKEND", "Agg")
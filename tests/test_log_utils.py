@@ -0,0 +1,204 @@
+import os
+import threading
+
+import matplotlib.pyplot as plt
+import numpy as np
+from tensorboard.backend.event_processing.event_accumulator import EventAccumulator
+
+from log_utils import UnifiedLogger
+
+
+def _read_events(logger):
+    accumulator = EventAccumulator(logger._logger.log_dir)
+    accumulator.Reload()
+    return accumulator
+
+
+def test_tensorboard_writes_from_background_thread(tmp_path):
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [1, 0])
+    logger.log({"epoch": 3, "train": {"loss": np.float32(0.5), "acc": np.array(0.9)}, "plot": fig})
+    logger.close()
+
+    events = _read_events(logger)
+    assert [(e.step, e.value) for e in events.Scalars("train/loss")] == [(3, 0.5)]
+    assert [e.step for e in events.Scalars("train/acc")] == [3]
+    assert [e.step for e in events.Images("plot")] == [3]
+
+
+def test_tensorboard_renders_figures_on_calling_thread(tmp_path, monkeypatch):
+    import log_utils
+
+    render_threads = []
+    render_figure = log_utils._render_figure
+
+    def recording_render(figure):
+        render_threads.append(threading.current_thread())
+        return render_figure(figure)
+
+    monkeypatch.setattr(log_utils, "_render_figure", recording_render)
+    # Rebuild the dispatch table so it picks up the patched function.
+    monkeypatch.setattr(log_utils.UnifiedExperiment, "_TB_DISPATCH", {})
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    fig, _ = plt.subplots()
+    logger.log({"plot": fig})
+    logger.close()
+
+    assert render_threads == [threading.current_thread()]
+
+
+def test_tensorboard_queues_copies_of_arrays_and_images(tmp_path):
+    from PIL import Image
+
+    image_path = tmp_path / "image.png"
+    Image.new("RGB", (4, 4), (255, 0, 0)).save(image_path)
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    buf = np.zeros((4, 4, 3), dtype=np.uint8)
+    for step in range(1, 4):
+        buf[:] = step * 50
+        with Image.open(image_path) as img:
+            logger.log({"epoch": step, "arr": buf, "img": img})
+        buf[:] = 0
+    logger.close()
+
+    events = _read_events(logger)
+    assert len(events.Images("img")) == 3
+    # A constant image encodes to the same PNG, so distinct steps mean distinct contents.
+    assert len({e.encoded_image_string for e in events.Images("arr")}) == 3
+
+
+def test_tensorboard_records_walltime_of_log_call(tmp_path, monkeypatch):
+    import log_utils
+
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    monkeypatch.setattr(log_utils.time, "time", lambda: 1234.0)
+    logger.log({"epoch": 0, "loss": 1.0, "arr": np.zeros((2, 2, 3), dtype=np.uint8)})
+    monkeypatch.undo()
+    logger.close()
+
+    events = _read_events(logger)
+    assert [e.wall_time for e in events.Scalars("loss")] == [1234.0]
+    assert [e.wall_time for e in events.Images("arr")] == [1234.0]
+
+
+def test_tensorboard_save_writes_queued_events(tmp_path):
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    for step in range(100):
+        logger.log({"epoch": step, "loss": float(step), "arr": np.zeros((64, 64, 3), dtype=np.uint8)})
+    logger.save()
+
+    assert len(_read_events(logger).Scalars("loss")) == 100
+    logger.close()
+
+
+def test_tensorboard_events_are_written_without_close(tmp_path):
+    import subprocess
+    import sys
+
+    script = (
+        "import numpy as np\n"
+        "from log_utils import UnifiedLogger\n"
+        f"logger = UnifiedLogger('tensorboard', save_dir={str(tmp_path)!r}, name='run', version=0)\n"
+        "for step in range(200):\n"
+        "    logger.log({'epoch': step, 'loss': float(step), 'img': np.zeros((256, 256, 3), dtype=np.uint8)})\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+
+    events = EventAccumulator(str(tmp_path / "run" / "version_0"))
+    events.Reload()
+    assert len(events.Scalars("loss")) == 200
+
+
+def test_tensorboard_logs_after_close_are_written(tmp_path):
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    logger.close()
+    for step in range(100):
+        logger.log({"epoch": step, "loss": float(step)})
+    logger._logger.experiment.flush()
+
+    assert len(_read_events(logger).Scalars("loss")) == 100
+
+
+def test_tensorboard_flattens_dict_subclasses(tmp_path):
+    from collections import OrderedDict
+
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    logger.log({"epoch": 0, "val": OrderedDict(loss=1.0)})
+    logger.close()
+
+    assert len(_read_events(logger).Scalars("val/loss")) == 1
+
+
+def test_log_does_not_modify_input(tmp_path):
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    data = {"epoch": 1, "train": {"loss": 0.1}}
+    logger.log(data)
+    logger.close()
+
+    assert data == {"epoch": 1, "train": {"loss": 0.1}}
+
+
+class _FakeRun:
+    def __init__(self):
+        self.logged = []
+
+    def log(self, data):
+        self.logged.append(data)
+
+
+def test_wandb_reuses_image_only_for_unchanged_figures():
+    from log_utils import UnifiedExperiment
+
+    run = _FakeRun()
+    experiment = UnifiedExperiment(run, "wandb")
+    fig, ax = plt.subplots()
+    (line,) = ax.plot([0, 1], [0, 1])
+
+    experiment.log({"plot": fig})
+    experiment.log({"plot": fig})
+    assert run.logged[1]["plot"] is run.logged[0]["plot"]
+
+    # Modified and redrawn (e.g. plt.pause or an interactive backend) before logging.
+    line.set_ydata([1, 0])
+    fig.canvas.draw()
+    experiment.log({"plot": fig})
+    assert run.logged[2]["plot"] is not run.logged[1]["plot"]
+
+    # Modified without a redraw.
+    line.set_ydata([0, 0])
+    experiment.log({"plot": ax})
+    assert run.logged[3]["plot"] is not run.logged[2]["plot"]
+
+
+def test_tensorboard_writes_scalars_of_a_step_as_one_event(tmp_path):
+    from tensorboard.backend.event_processing.event_file_loader import EventFileLoader
+
+    logger = UnifiedLogger("tensorboard", save_dir=str(tmp_path), name="run")
+    logger.log({"epoch": 7, "train": {"loss": 0.5, "acc": 0.25}})
+    logger.close()
+
+    (event_file,) = (tmp_path / "run").rglob("events.out.tfevents.*")
+    summaries = [e for e in EventFileLoader(str(event_file)).Load() if e.HasField("summary")]
+    assert len(summaries) == 1
+    assert summaries[0].step == 7
+    assert {v.tag for v in summaries[0].summary.value} == {"train/loss", "train/acc"}
+
+
+def test_lazy_caches_missing_optional_modules(monkeypatch):
+    import importlib
+
+    import log_utils
+
+    calls = []
+    import_module = importlib.import_module
+
+    def counting_import(name):
+        calls.append(name)
+        return import_module(name)
+
+    monkeypatch.setattr(log_utils.importlib, "import_module", counting_import)
+    monkeypatch.delitem(log_utils._MODULES, "no_such_module_xyz", raising=False)
+    assert log_utils._lazy("no_such_module_xyz", optional=True) is None
+    assert log_utils._lazy("no_such_module_xyz", optional=True) is None
+    assert calls == ["no_such_module_xyz"]
@@ -0,0 +1,53 @@
+from omegaconf import OmegaConf
+
+import run_exp
+from run_exp import _cached_instantiate
+
+
+class Encoder:
+    def __init__(self, width=8):
+        self.width = width
+
+
+class Net:
+    def __init__(self, enc=None, width=8):
+        self.enc = enc
+        self.width = width
+
+
+def test_cached_instantiate_returns_fresh_objects():
+    cfg = OmegaConf.create({"_target_": f"{__name__}.Net", "width": 4})
+
+    first = _cached_instantiate(cfg)
+    cache_size = len(run_exp._INSTANTIATE_CACHE)
+    second = _cached_instantiate(cfg)
+
+    assert len(run_exp._INSTANTIATE_CACHE) == cache_size
+    assert first is not second
+    assert second.width == 4
+
+
+def test_cached_instantiate_does_not_share_nested_objects():
+    cfg = OmegaConf.create({"_target_": f"{__name__}.Net", "enc": {"_target_": f"{__name__}.Encoder"}})
+
+    first = _cached_instantiate(cfg)
+    first.enc.width = 99
+    second = _cached_instantiate(cfg)
+
+    assert second.enc is not first.enc
+    assert second.enc.width == 8
+
+
+def test_cached_instantiate_without_target():
+    cfg = OmegaConf.create({"width": 4})
+
+    assert OmegaConf.to_container(_cached_instantiate(cfg)) == {"width": 4}
+
+
+def test_cached_instantiate_distinguishes_equal_values_of_different_types():
+    results = [
+        _cached_instantiate(OmegaConf.create({"_target_": f"{__name__}.Net", "width": width}))
+        for width in (True, 1, 1.0)
+    ]
+
+    assert [type(net.width) for net in results] == [bool, int, float]